@@ -1,3 +1,38 @@
+import sys
+from itertools import chain
+
+RESOLVE_CACHE_SIZE = 128
+
+# Type tags compared in traversal loops instead of calling isinstance per item
+FILE_KIND = 0
+FOLDER_KIND = 1
+
+
+def _parse_path(path):
+    """
+    Splits a path once at the API boundary so it can be passed around as interned tokens.
+
+    Parameters:
+    -----------
+    path : str
+        The path to split, e.g., '/folder1/folder2' or 'folder2/file.txt'.
+
+    Returns:
+    --------
+    tuple of (bool, tuple of str)
+        Whether the path is absolute, and its non-empty components.
+    """
+    absolute = path.startswith("/")
+    parts = tuple(sys.intern(part) for part in path.split("/") if part)
+    return absolute, parts
+
+
+def _extension(name):
+    """Returns the part of a file name after its last dot, or '' if it has none."""
+    _, dot, ext = name.rpartition(".")
+    return ext if dot else ""
+
+
 class File:
     """
     Represents a file in the file system.
@@ -6,30 +41,36 @@ class File:
     -----------
     name : str
         The name of the file.
-    data : list of str
-        The content of the file, split into lines.
+    parent : Folder or None
+        The folder containing this file, or None if it has not been added anywhere.
+    _buf : bytearray
+        The UTF-8 encoded content of the file.
 
     Methods:
     --------
     read():
-        Returns the content of the file as a single string with lines joined by newline characters.
+        Returns the content of the file as a single string.
     append(content):
         Appends a new line of content to the file.
     """
+    _kind = FILE_KIND
+
     def __init__(self, name, data=""):
         self.name = name
-        self.data = data.splitlines()
+        self.parent = None
+        self._buf = bytearray(data.encode("utf-8"))
 
     def read(self):
         """
-        Returns the content of the file as a single string with lines joined by newline characters.
+        Returns the content of the file as a single string, exactly as it was written.
+        Trailing newlines and '\\r\\n' line endings are kept.
         
         Returns:
         --------
         str
             The content of the file.
         """
-        return "\n".join(self.data)
+        return self._buf.decode("utf-8")
 
     def append(self, content):
         """
@@ -40,7 +81,9 @@ class File:
         content : str
             The content to append to the file.
         """
-        self.data.append(content)
+        if self._buf and self._buf[-1] != 0x0A:
+            self._buf.append(0x0A)
+        self._buf.extend(content.encode("utf-8"))
 
 class Folder:
     """
@@ -50,9 +93,12 @@ class Folder:
     -----------
     name : str
         The name of the folder.
-    contents : dict
-        A dictionary containing the items (files and subfolders) within the folder, 
-        where the keys are item names and the values are the items.
+    files : dict
+        The files within the folder, keyed by name.
+    subfolders : dict
+        The subfolders within the folder, keyed by name.
+    parent : Folder or None
+        The folder containing this folder, or None if it has not been added anywhere.
 
     Methods:
     --------
@@ -64,10 +110,18 @@ class Folder:
         Retrieves an item (file or folder) from the current folder by name.
     list_contents():
         Lists the names of all items in the current folder.
+    __iter__():
+        Iterates over the names of all items in the current folder.
+    __contains__(name):
+        Checks whether a file or folder with the given name is in the current folder.
     """
+    _kind = FOLDER_KIND
+
     def __init__(self, name):
         self.name = name
-        self.contents = {}
+        self.files = {}
+        self.subfolders = {}
+        self.parent = None
 
     def add(self, item):
         """
@@ -78,7 +132,18 @@ class Folder:
         item : File or Folder
             The item to add to the folder.
         """
-        self.contents[item.name] = item
+        name = sys.intern(item.name)
+        replaced = self.files.pop(name, None)
+        if replaced is None:
+            replaced = self.subfolders.pop(name, None)
+        if replaced is not None and replaced is not item:
+            # Like remove, detach whatever the new item overwrites
+            replaced.parent = None
+        if item._kind == FOLDER_KIND:
+            self.subfolders[name] = item
+        else:
+            self.files[name] = item
+        item.parent = self
 
     def remove(self, name):
         """
@@ -89,8 +154,11 @@ class Folder:
         name : str
             The name of the item to remove.
         """
-        if name in self.contents:
-            del self.contents[name]
+        item = self.files.pop(name, None)
+        if item is None:
+            item = self.subfolders.pop(name, None)
+        if item is not None:
+            item.parent = None
 
     def get(self, name):
         """
@@ -111,9 +179,12 @@ class Folder:
         ValueError
             If the item with the specified name is not found.
         """
-        if name in self.contents:
-            return self.contents[name]
-        raise ValueError("Item not found")
+        item = self.files.get(name)
+        if item is None:
+            item = self.subfolders.get(name)
+            if item is None:
+                raise ValueError("Item not found")
+        return item
 
     def list_contents(self):
         """
@@ -124,7 +195,15 @@ class Folder:
         list of str
             The names of the items in the folder.
         """
-        return [item.name for item in self.contents.values()]
+        return list(self.files) + list(self.subfolders)
+
+    def __iter__(self):
+        """Iterates over the names of the items in the folder without copying them."""
+        return chain(self.files, self.subfolders)
+
+    def __contains__(self, name):
+        """Checks whether a file or folder with the given name is in the folder."""
+        return name in self.files or name in self.subfolders
 
 
 class FileSystem:
@@ -132,16 +211,34 @@ class FileSystem:
         """Initializes the file system with a root folder."""
         self.root = Folder("root")
         self.current_folder = self.root
+        self._mutation_epoch = 0
+        self._resolve_cache = {}
+        self._path_index = {self.root.name: self.root}
+        self._cached_full_path = None
+        self._ext_index = {}
+        self._name_index = {}
 
-    def get_full_path(self):
+    def get_full_path(self, folder=None):
         """
         Returns the full path from the root to the current folder as a string.
+
+        Parameters:
+        -----------
+        folder : Folder, optional
+            The folder whose path is returned. Default is the current folder.
         """
+        if folder is None or folder is self.current_folder:
+            if self._cached_full_path is None:
+                self._cached_full_path = self._build_full_path(self.current_folder)
+            return self._cached_full_path
+        return self._build_full_path(folder)
+
+    def _build_full_path(self, folder):
+        """Walks the parent pointers of a folder up to the root and joins the names."""
         path_parts = []
-        folder = self.current_folder
-        while folder != self.root:
+        while folder is not self.root and folder is not None:
             path_parts.append(folder.name)
-            folder = self.find_parent(folder)
+            folder = folder.parent
         path_parts.append(self.root.name)
         return "/".join(reversed(path_parts))
 
@@ -154,27 +251,10 @@ class FileSystem:
         path : str
             The path to the new folder, e.g., 'folder1/folder2'.
         """
-        if path == "/":
-            self.current_folder = self.root
-        else:
-            parts = path.strip("/").split("/")
-            if path.startswith("/"):
-                folder = self.root
-            else:
-                folder = self.current_folder
-
-            for part in parts:
-                if part == "..":
-                    # Go up one directory
-                    if folder == self.root:
-                        raise ValueError("Already at the root directory.")
-                    folder = self.find_parent(folder)
-                elif part in folder.contents and isinstance(folder.contents[part], Folder):
-                    folder = folder.contents[part]
-                else:
-                    raise ValueError(f"Invalid path: '{path}' does not exist or is not a folder.")
-
-            self.current_folder = folder
+        self.current_folder = self._resolve(
+            _parse_path(path), error=f"Invalid path: '{path}' does not exist or is not a folder."
+        )
+        self._cached_full_path = None
 
     def find_parent(self, folder):
         """
@@ -190,10 +270,207 @@ class FileSystem:
         Folder
             The parent folder.
         """
-        for item in self.root.contents.values():
-            if isinstance(item, Folder) and folder in item.contents.values():
-                return item
-        return self.root  # Return root if no parent found (or handle appropriately)
+        if folder is self.root:
+            return folder
+        parent = folder.parent
+        return self.root if parent is None else parent
+
+    def _is_attached(self, item):
+        """Checks whether an item can still be reached from the root through its parents."""
+        while item is not self.root:
+            if item is None:
+                return False
+            item = item.parent
+        return True
+
+    def _index_tree(self, folder, add=True):
+        """
+        Adds a folder and all of its subfolders to the path index, or removes them.
+
+        Parameters:
+        -----------
+        folder : Folder
+            The top of the subtree. Must still be attached when removing.
+        add : bool, optional
+            If False, the subtree's entries are removed instead.
+        """
+        if not self._is_attached(folder):
+            # Detached subtrees (e.g. below a deleted current folder) have no real path
+            return
+        stack = [(folder, self._build_full_path(folder))]
+        while stack:
+            folder, path = stack.pop()
+            if add:
+                self._path_index[path] = folder
+            else:
+                self._path_index.pop(path, None)
+            for item_name, item in folder.subfolders.items():
+                stack.append((item, f"{path}/{item_name}"))
+
+    def _index_items(self, item, add=True):
+        """
+        Adds an item and everything below it to the name and extension indexes, or removes them.
+
+        Parameters:
+        -----------
+        item : File or Folder
+            The file, or the top of the subtree to index.
+        add : bool, optional
+            If False, the items are removed from the indexes instead.
+        """
+        if add and not self._is_attached(item):
+            # Items below a deleted or overwritten folder can never be found from the root
+            return
+        if item._kind == FILE_KIND:
+            files, folders = [item], []
+        else:
+            files, folders = [], [item]
+            stack = [item]
+            while stack:
+                folder = stack.pop()
+                files.extend(folder.files.values())
+                folders.extend(folder.subfolders.values())
+                stack.extend(folder.subfolders.values())
+
+        for index, key, entry in chain(
+            ((self._name_index, entry.name, entry) for entry in chain(files, folders)),
+            ((self._ext_index, sys.intern(_extension(file.name)), file) for file in files),
+        ):
+            if add:
+                index.setdefault(key, {})[entry] = None
+            elif key in index:
+                bucket = index[key]
+                bucket.pop(entry, None)
+                if not bucket:
+                    del index[key]
+
+    def _path_below(self, item, folder, prefix):
+        """
+        Builds the path of an item from the path of a folder above it.
+
+        Parameters:
+        -----------
+        item : File or Folder
+            The item whose path is built.
+        folder : Folder
+            The folder the path starts from.
+        prefix : str
+            The full path of `folder`.
+
+        Returns:
+        --------
+        str or None
+            The path of the item, or None if it is not below `folder`.
+        """
+        path_parts = [item.name]
+        parent = item.parent
+        while parent is not None and parent is not folder:
+            path_parts.append(parent.name)
+            parent = parent.parent
+        if parent is None:
+            return None
+        path_parts.append(prefix)
+        return "/".join(reversed(path_parts))
+
+    def _unindex_replaced(self, folder, name):
+        """Drops the index entries of an item that is about to be deleted or overwritten."""
+        item = folder.subfolders.get(name)
+        if item is not None:
+            self._forget_current_path(item)
+            self._index_tree(item, add=False)
+        else:
+            item = folder.files.get(name)
+        if item is not None:
+            self._index_items(item, add=False)
+
+    def _forget_current_path(self, item):
+        """Drops the cached current path if the item is the current folder or one of its ancestors."""
+        if self._cached_full_path is None or not isinstance(item, Folder):
+            return
+        folder = self.current_folder
+        while folder is not None:
+            if folder is item:
+                self._cached_full_path = None
+                return
+            folder = folder.parent
+
+    def _invalidate(self):
+        """Marks the tree as changed so cached path resolutions are no longer used."""
+        self._mutation_epoch += 1
+
+    def _resolve(self, parsed, want_parent=False, error="Invalid path"):
+        """
+        Walks a path from the root (if absolute) or the current folder.
+
+        Parameters:
+        -----------
+        parsed : tuple of (bool, tuple of str)
+            The path to resolve, as returned by _parse_path. '..' steps up to the parent folder.
+        want_parent : bool, optional
+            If True, the last component is not walked and is returned along with its folder.
+        error : str, optional
+            The message of the ValueError raised when a component is missing or not a folder.
+
+        Returns:
+        --------
+        Folder or tuple of (Folder, str)
+            The resolved folder, or the parent folder and the last component name.
+
+        Raises:
+        -------
+        ValueError
+            If a component does not exist or is not a folder.
+        """
+        absolute, parts = parsed
+        last = None
+        if want_parent:
+            last = parts[-1] if parts else ""
+            parts = parts[:-1]
+        if absolute:
+            folder = self.root
+            full_path = "/".join([self.root.name, *parts])
+            trusted = True
+        else:
+            folder = self.current_folder
+            current_path = self.get_full_path()
+            full_path = "/".join([current_path, *parts])
+            # A deleted or overwritten current folder can share its path string with a live
+            # folder, so the string only stands for it while the index still maps it there
+            trusted = self._path_index.get(current_path) is folder
+
+        # The path index only holds canonical paths, so the epoch cache is only for paths with
+        # '..' in them. Those are never looked up in the index: 'x/..' can name a folder called '..'
+        use_cache = trusted and ".." in parts
+        if trusted and not use_cache:
+            cached = self._path_index.get(full_path)
+            if cached is not None:
+                return (cached, last) if want_parent else cached
+
+        key = (full_path, self._mutation_epoch)
+        cached = self._resolve_cache.get(key) if use_cache else None
+        if cached is not None:
+            return (cached, last) if want_parent else cached
+
+        for part in parts:
+            if part == "..":
+                # Go up one directory
+                if folder is self.root:
+                    raise ValueError("Already at the root directory.")
+                # find_parent falls back to the root for detached folders
+                folder = self.find_parent(folder)
+                continue
+            folder = folder.subfolders.get(part)
+            if folder is None:
+                raise ValueError(error)
+
+        if use_cache and folder is not None:
+            if len(self._resolve_cache) >= RESOLVE_CACHE_SIZE:
+                del self._resolve_cache[next(iter(self._resolve_cache))]
+            self._resolve_cache[key] = folder
+
+        if want_parent:
+            return folder, last
+        return folder
 
     def list_directory(self):
         """Lists the contents of the current folder."""
@@ -220,18 +497,18 @@ class FileSystem:
                 folder = self.current_folder
             else:
                 # If both path and name are provided, navigate to the specified path
-                folder = self.root if path.startswith("/") else self.current_folder
-                path_parts = path.strip("/").split("/")
-                for part in path_parts:
-                    folder = folder.get(part)
-                    if not isinstance(folder, Folder):
-                        raise ValueError(f"Invalid path: '{path}' does not exist or is not a folder.")
-
-        if name in folder.contents:
+                folder = self._resolve(
+                    _parse_path(path), error=f"Invalid path: '{path}' does not exist or is not a folder."
+                )
+
+        if name in folder:
             raise ValueError(f"A file or folder with the name '{name}' already exists.")
 
         new_folder = Folder(name)
         folder.add(new_folder)
+        self._index_tree(new_folder)
+        self._index_items(new_folder)
+        self._invalidate()
 
     def create_file(self, path, content=""):
         """
@@ -245,20 +522,16 @@ class FileSystem:
         content : str, optional
             The initial content of the file. Default is an empty string.
         """
-        path_parts = path.strip("/").split("/")
-        filename = path_parts.pop()
+        folder, filename = self._resolve(
+            _parse_path(path), want_parent=True, error=f"Invalid path: '{path}' does not exist or is not a folder."
+        )
 
-        folder = self.current_folder
-        if path_parts:
-            folder = self.root if path.startswith("/") else self.current_folder
-            for part in path_parts:
-                folder = folder.get(part)
-                if not isinstance(folder, Folder):
-                    raise ValueError(f"Folder '{part}' does not exist.")
-
-        if filename in folder.contents:
+        if filename in folder:
             raise ValueError(f"File '{filename}' already exists.")
-        folder.contents[filename] = File(filename, content)
+        new_file = File(filename, content)
+        folder.add(new_file)
+        self._index_items(new_file)
+        self._invalidate()
 
     def read_file(self, path):
         """
@@ -269,15 +542,7 @@ class FileSystem:
         path : str
             The path to the file.
         """
-        path_parts = path.strip("/").split("/")
-        filename = path_parts.pop()
-        folder = self.root if path.startswith("/") else self.current_folder
-
-        for part in path_parts:
-            folder = folder.get(part)
-            if not isinstance(folder, Folder):
-                raise ValueError("Invalid path")
-
+        folder, filename = self._resolve(_parse_path(path), want_parent=True)
         file = folder.get(filename)
         if isinstance(file, File):
             return file.read()
@@ -295,41 +560,32 @@ class FileSystem:
         destination_path : str
             The path where the file or folder should be moved to.
         """
-        # Handle absolute paths
-        if source_path.startswith("/"):
-            src_parts = source_path.strip("/").split("/")
-            src_name = src_parts.pop()
-            src_folder = self.root
-        else:
-            src_parts = source_path.strip("/").split("/")
-            src_name = src_parts.pop()
-            src_folder = self.current_folder
-
-        for part in src_parts:
-            src_folder = src_folder.get(part)
-            if not isinstance(src_folder, Folder):
-                raise ValueError("Invalid source path")
-
+        src_folder, src_name = self._resolve(_parse_path(source_path), want_parent=True, error="Invalid source path")
         item = src_folder.get(src_name)
-
-        # Handle absolute paths
-        if destination_path.startswith("/"):
-            dest_parts = destination_path.strip("/").split("/")
-            dest_name = dest_parts.pop()
-            dest_folder = self.root
-        else:
-            dest_parts = destination_path.strip("/").split("/")
-            dest_name = dest_parts.pop()
-            dest_folder = self.current_folder
-
-        for part in dest_parts:
-            dest_folder = dest_folder.get(part)
-            if not isinstance(dest_folder, Folder):
-                raise ValueError("Invalid destination path")
-
+        dest_folder, dest_name = self._resolve(
+            _parse_path(destination_path), want_parent=True, error="Invalid destination path"
+        )
+
+        if isinstance(item, Folder):
+            # Moving a folder into itself or below itself would make its parent chain a cycle
+            folder = dest_folder
+            while folder is not None:
+                if folder is item:
+                    raise ValueError("Cannot move a folder into itself.")
+                folder = folder.parent
+
+        self._unindex_replaced(dest_folder, dest_name)
+        self._forget_current_path(item)
+        if isinstance(item, Folder):
+            self._index_tree(item, add=False)
+        self._index_items(item, add=False)
         src_folder.remove(src_name)
         item.name = dest_name
         dest_folder.add(item)
+        if isinstance(item, Folder):
+            self._index_tree(item)
+        self._index_items(item)
+        self._invalidate()
 
     def copy(self, source_path, destination_path):
         """
@@ -342,45 +598,53 @@ class FileSystem:
         destination_path : str
             The path where the file or folder should be copied to.
         """
-        # Handle absolute paths
-        if source_path.startswith("/"):
-            src_parts = source_path.strip("/").split("/")
-            src_name = src_parts.pop()
-            src_folder = self.root
-        else:
-            src_parts = source_path.strip("/").split("/")
-            src_name = src_parts.pop()
-            src_folder = self.current_folder
+        src_folder, src_name = self._resolve(_parse_path(source_path), want_parent=True, error="Invalid source path")
+        item = src_folder.get(src_name)
+        dest_folder, dest_name = self._resolve(
+            _parse_path(destination_path), want_parent=True, error="Invalid destination path"
+        )
 
-        for part in src_parts:
-            src_folder = src_folder.get(part)
-            if not isinstance(src_folder, Folder):
-                raise ValueError("Invalid source path")
+        new_item = self._deep_copy(item, dest_name)
 
-        item = src_folder.get(src_name)
+        self._unindex_replaced(dest_folder, dest_name)
+        dest_folder.add(new_item)
+        if isinstance(new_item, Folder):
+            self._index_tree(new_item)
+        self._index_items(new_item)
+        self._invalidate()
 
-        # Handle absolute paths
-        if destination_path.startswith("/"):
-            dest_parts = destination_path.strip("/").split("/")
-            dest_name = dest_parts.pop()
-            dest_folder = self.root
-        else:
-            dest_parts = destination_path.strip("/").split("/")
-            dest_name = dest_parts.pop()
-            dest_folder = self.current_folder
+    def _deep_copy(self, item, name):
+        """
+        Copies a file or a whole folder subtree so that nothing is shared with the original.
 
-        for part in dest_parts:
-            dest_folder = dest_folder.get(part)
-            if not isinstance(dest_folder, Folder):
-                raise ValueError("Invalid destination path")
+        Parameters:
+        -----------
+        item : File or Folder
+            The item to copy.
+        name : str
+            The name of the copy.
 
+        Returns:
+        --------
+        File or Folder
+            The detached copy.
+        """
         if isinstance(item, File):
-            new_item = File(dest_name, item.read())
-        else:
-            new_item = Folder(dest_name)
-            new_item.contents = item.contents.copy()
+            new_file = File(name)
+            new_file._buf = bytearray(item._buf)
+            return new_file
 
-        dest_folder.add(new_item)
+        new_folder = Folder(name)
+        stack = [(item, new_folder)]
+        while stack:
+            src, dest = stack.pop()
+            for child_name, child in src.files.items():
+                dest.add(self._deep_copy(child, child_name))
+            for child_name, child in src.subfolders.items():
+                child_copy = Folder(child_name)
+                dest.add(child_copy)
+                stack.append((child, child_copy))
+        return new_folder
 
     def delete(self, path):
         """
@@ -391,16 +655,11 @@ class FileSystem:
         path : str
             The path of the file or folder to delete.
         """
-        path_parts = path.strip("/").split("/")
-        name = path_parts.pop()
-        folder = self.root if path.startswith("/") else self.current_folder
-
-        for part in path_parts:
-            folder = folder.get(part)
-            if not isinstance(folder, Folder):
-                raise ValueError("Invalid path")
+        folder, name = self._resolve(_parse_path(path), want_parent=True)
 
+        self._unindex_replaced(folder, name)
         folder.remove(name)
+        self._invalidate()
 
     def rename(self, path, new_name):
         """
@@ -413,21 +672,23 @@ class FileSystem:
         new_name : str
             The new name for the file or folder.
         """
-        path_parts = path.strip("/").split("/")
-        name = path_parts.pop()
-        folder = self.root if path.startswith("/") else self.current_folder
-
-        for part in path_parts:
-            folder = folder.get(part)
-            if not isinstance(folder, Folder):
-                raise ValueError("Invalid path")
+        folder, name = self._resolve(_parse_path(path), want_parent=True)
 
         item = folder.get(name)
+        self._unindex_replaced(folder, new_name)
+        self._forget_current_path(item)
+        if isinstance(item, Folder):
+            self._index_tree(item, add=False)
+        self._index_items(item, add=False)
         folder.remove(name)
         item.name = new_name
         folder.add(item)
+        if isinstance(item, Folder):
+            self._index_tree(item)
+        self._index_items(item)
+        self._invalidate()
 
-    def search(self, name, folder=None):
+    def search(self, name, folder=None, prefix=None):
         """
         Searches for files or folders with a specific name in the current folder or a specified folder.
 
@@ -437,43 +698,66 @@ class FileSystem:
             The name to search for.
         folder : Folder, optional
             The folder to search in. Default is the current folder.
+        prefix : str, optional
+            The full path of `folder`. Computed when not provided.
+
+        Yields:
+        -------
+        str
+            The full path of each match. Wrap in list() to keep the results across mutations.
         """
         if folder is None:
             folder = self.current_folder
+        if prefix is None:
+            prefix = self.get_full_path(folder)
 
-        results = []
-
-        for item_name, item in folder.contents.items():
-            if item_name == name:
-                results.append(f"{self.get_full_path()}/{item_name}")
-            if isinstance(item, Folder):
-                results.extend(self.search(name, item))
-
-        return results
+        for item in self._name_index.get(name, ()):
+            path = self._path_below(item, folder, prefix)
+            if path is not None:
+                yield path
 
-    def search_by_extension(self, extension, folder=None):
+    def search_by_extension(self, extension, folder=None, prefix=None):
         """
         Searches for files with a specific extension in the current folder or a specified folder.
 
         Parameters:
         -----------
         extension : str
-            The file extension to search for, e.g., 'py'.
+            The file extension to search for, e.g., 'py', '.py' or 'tar.gz'.
+            An empty extension matches every file.
         folder : Folder, optional
             The folder to search in. Default is the current folder.
+        prefix : str, optional
+            The full path of `folder`. Computed when not provided.
+
+        Yields:
+        -------
+        str
+            The full path of each matching file. Wrap in list() to keep the results across mutations.
         """
         if folder is None:
             folder = self.current_folder
+        if prefix is None:
+            prefix = self.get_full_path(folder)
+
+        query = extension.lstrip(".")
+        if not query:
+            candidates = chain.from_iterable(self._ext_index.values())
+        elif "." in query:
+            # Files are indexed by their last segment only, so multi-dot queries are filtered by name
+            suffix = "." + query
+            k = len(suffix)
+            candidates = (
+                file for file in self._ext_index.get(sys.intern(_extension(query)), ())
+                if file.name[-k:] == suffix
+            )
+        else:
+            candidates = self._ext_index.get(sys.intern(query), ())
 
-        results = []
-
-        for item_name, item in folder.contents.items():
-            if isinstance(item, File) and item_name.endswith(extension):
-                results.append(f"{self.get_full_path()}/{item_name}")
-            if isinstance(item, Folder):
-                results.extend(self.search_by_extension(extension, item))
-
-        return results
+        for file in candidates:
+            path = self._path_below(file, folder, prefix)
+            if path is not None:
+                yield path
 
     def save_state(self, filename):
         """
@@ -498,14 +782,14 @@ class FileSystem:
         file : file object
             The file to write the folder contents to.
         """
-        for item_name, item in folder.contents.items():
-            if isinstance(item, File):
-                file.write(f"File: {self.get_full_path()}/\n")
-                for line in item.data:
-                    file.write(f"{line}\n")
-            elif isinstance(item, Folder):
-                file.write(f"Folder: {self.get_full_path()}/\n")
-                self._save_folder(item, file)
+        for item in folder.files.values():
+            file.write(f"File: {self.get_full_path()}/\n")
+            content = item.read()
+            if content:
+                file.write(content if content.endswith("\n") else f"{content}\n")
+        for item in folder.subfolders.values():
+            file.write(f"Folder: {self.get_full_path()}/\n")
+            self._save_folder(item, file)
 
     def fragment(self, filename):
         """
@@ -535,13 +819,7 @@ class FileSystem:
         content : str
             The content to append to the file.
         """
-        parts = path.split("/")
-        filename = parts.pop()
-        folder = self.root if path.startswith("/") else self.current_folder
-        for part in parts:
-            folder = folder.get(part)
-            if not isinstance(folder, Folder):
-                raise ValueError("Invalid path")
+        folder, filename = self._resolve(_parse_path(path), want_parent=True)
         file = folder.get(filename)
         if isinstance(file, File):
             file.append(content)